@@ -0,0 +1,70 @@
+"""
+Bytes on disk and load time of cache entries, legacy JSON files compared
+with the codecs of the compact format, with and without compression.
+
+    python benchmarks/cache_format.py
+"""
+
+import json
+import os
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from payloads import team_payload
+
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp()
+
+from linear.cache import XDGCache  # noqa: E402
+
+ISSUE_COUNTS = [2, 50, 250, 2000]
+REPEAT = 50
+
+
+def load_time(load: Callable[[], dict]) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        load()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def load_legacy(file: Path) -> dict:
+    """How earlier versions loaded their plain JSON entries."""
+    return json.loads(file.read_text())
+
+
+def main():
+    print(f"{'issues':>6}  {'format':<12} {'on disk':>12} {'load':>10}")
+    for issue_count in ISSUE_COUNTS:
+        data = team_payload(issue_count)
+
+        legacy_file = Path(os.environ["XDG_CACHE_HOME"], "legacy.json")
+        legacy_file.write_text(json.dumps(data))
+        formats = [("legacy json", partial(load_legacy, legacy_file), legacy_file)]
+        for compress in (False, True):
+            for preparsed in (False, True):
+                cache = XDGCache(
+                    f"compact-{preparsed}-{compress}",
+                    preparsed=preparsed,
+                    compress=compress,
+                )
+                cache.set("query", data)
+                name = ("zlib " if compress else "") + (
+                    "pickle" if preparsed else "json"
+                )
+                load = partial(cache.get, "query")
+                formats.append((name, load, cache._query_cache_file("query")))
+
+        for name, load, file in formats:
+            assert load() == data
+            seconds = load_time(load)
+            print(
+                f"{issue_count:>6}  {name:<12} {file.stat().st_size / 1024:>8.1f} KiB "
+                f"{seconds * 1000:>7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time to render an issue with many threaded comments, end to end including
+highlighting, with comments highlighted by Pygments compared with
+`highlight.markdown_lines`.
+
+    python benchmarks/comments.py [--comments 1000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+from linear import highlight, printer
+from linear.client import Comment, Issue, WorkflowState
+
+WORDS = ["the", "issue", "should", "**cache**", "`code`", "[link](https://x)", "fix"]
+
+
+def issue_with_comments(count: int, seed: int = 1) -> Issue:
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1)
+    comments = [
+        Comment(
+            id=f"c{i}",
+            body=" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60))),
+            created_at=start + timedelta(minutes=i),
+            user_name="Alex Doe",
+            # Six out of ten comments reply to an earlier one.
+            parent_id=f"c{rng.randrange(i)}" if i and rng.random() < 0.6 else None,
+        )
+        for i in range(count)
+    ]
+    return Issue(
+        id="uuid",
+        identifier="ENG-1",
+        title="Many comments",
+        description="A description",
+        created_at=start,
+        url="https://linear.app/acme/issue/ENG-1",
+        state=WorkflowState(id="s1", name="In Progress", type="started"),
+        children=[],
+        comments=comments,
+    )
+
+
+def render_time(issue: Issue, repeat: int = 5) -> float:
+    """The fastest of `repeat` renders."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        printer.issue_markdown(issue)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=1000)
+    args = parser.parse_args()
+
+    issue = issue_with_comments(args.comments)
+    # Build the comment tree outside of the measurements.
+    issue.comment_tree
+    lines = render_time(issue)
+    with mock.patch.object(highlight, "markdown_lines", highlight.markdown):
+        pygments = render_time(issue)
+    print(f"{args.comments} comments")
+    print(f"pygments        {pygments * 1000:>8.1f} ms")
+    print(f"markdown_lines  {lines * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
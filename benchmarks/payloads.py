@@ -0,0 +1,44 @@
+"""
+Synthetic Linear API responses for the benchmarks.
+"""
+
+import random
+
+WORDS = [
+    "the",
+    "issue",
+    "should",
+    "cache",
+    "linear",
+    "request",
+    "team",
+    "state",
+    "render",
+    "comment",
+    "api",
+    "fix",
+]
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def issue_node(rng: random.Random, i: int, max_words: int = 300) -> dict:
+    return {
+        "id": f"{i:08x}-aaaa-bbbb-cccc-{i:012x}",
+        "identifier": f"ENG-{i}",
+        "title": _words(rng, 8),
+        "createdAt": "2024-05-01T10:00:00.000Z",
+        "description": _words(rng, rng.randint(20, max_words)),
+        "url": f"https://linear.app/acme/issue/ENG-{i}",
+        "assignee": {"id": "u1", "name": "Alex Doe", "email": "alex@example.com"},
+        "state": {"id": "s1", "name": "In Progress", "type": "started"},
+    }
+
+
+def team_payload(issue_count: int, max_words: int = 300, seed: int = 1) -> dict:
+    """A GetTeam response with `issue_count` issues."""
+    rng = random.Random(seed)
+    nodes = [issue_node(rng, i, max_words) for i in range(issue_count)]
+    return {"data": {"team": {"id": "t", "name": "Eng", "issues": {"nodes": nodes}}}}
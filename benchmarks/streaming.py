@@ -0,0 +1,150 @@
+"""
+Time to the first issue and peak memory of `LinearClient.get_team`, which
+decodes the GetTeam response as a whole, compared with
+`LinearClient.iter_team_issues`, which streams it. Both go through the
+client's cache, starting with an empty one, so writing the cache entry is
+included.
+
+Every run fetches the team in a fresh process, so that its peak RSS is not
+inflated by earlier runs. Linux carries the peak RSS over `exec`, so the
+response is generated in a process of its own as well. The transport reads
+it from disk in chunks of `STREAM_CHUNK_SIZE`, with an optional delay per
+chunk to mimic a download.
+
+    python benchmarks/streaming.py [--issues 5000] [--chunk-delay 0.001]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from payloads import team_payload
+
+from linear.cache import XDGCache
+from linear.client import STREAM_CHUNK_SIZE, LinearClient
+
+
+class FileResponse:
+    """A response whose body is read from a file as it is consumed."""
+
+    status_code = 200
+    headers: dict[str, str] = {}
+
+    def __init__(self, path: Path, delay: float):
+        self._path = path
+        self._delay = delay
+
+    def json(self):
+        return json.loads(b"".join(self.iter_content(STREAM_CHUNK_SIZE)))
+
+    def iter_content(self, chunk_size: int):
+        with self._path.open("rb") as f:
+            while chunk := f.read(chunk_size):
+                time.sleep(self._delay)
+                yield chunk
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FileTransport:
+    def __init__(self, path: Path, delay: float):
+        self._path = path
+        self._delay = delay
+
+    def post(self, url, headers, json, stream=False):
+        return FileResponse(self._path, self._delay)
+
+
+def peak_rss_kib() -> int:
+    # ru_maxrss is in KiB on Linux, in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run(mode: str, path: Path, delay: float):
+    """Fetch the team once and print the measurements as JSON."""
+    with tempfile.TemporaryDirectory() as cache_home:
+        os.environ["XDG_CACHE_HOME"] = cache_home
+        client = LinearClient(
+            "url", "key", XDGCache("linear"), transport=FileTransport(path, delay)
+        )
+        baseline = peak_rss_kib()
+        start = time.perf_counter()
+        first = None
+        count = 0
+        if mode == "get_team":
+            issues = iter(client.get_team("t").issues)
+        else:
+            issues = client.iter_team_issues("t")
+        for _ in issues:
+            if first is None:
+                first = time.perf_counter() - start
+            count += 1
+        total = time.perf_counter() - start
+        print(
+            json.dumps(
+                {
+                    "count": count,
+                    "first": first,
+                    "total": total,
+                    "rss": peak_rss_kib() - baseline,
+                }
+            )
+        )
+
+
+def run_script(*args: str) -> str:
+    return subprocess.run(
+        [sys.executable, __file__, *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def measure(mode: str, path: Path, delay: float) -> dict:
+    return json.loads(run_script("--run", mode, str(path), f"--chunk-delay={delay}"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--chunk-delay", type=float, default=0.0)
+    parser.add_argument("--run", nargs=2, metavar=("MODE", "PATH"))
+    parser.add_argument("--write", metavar="PATH")
+    args = parser.parse_args()
+    if args.write:
+        Path(args.write).write_text(json.dumps(team_payload(args.issues)))
+        return
+    if args.run:
+        mode, path = args.run
+        run(mode, Path(path), args.chunk_delay)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".json") as f:
+        path = Path(f.name)
+        run_script("--write", str(path), f"--issues={args.issues}")
+        size = path.stat().st_size / 1024 / 1024
+        print(f"{args.issues} issues, {size:.1f} MiB, {args.chunk_delay}s per chunk")
+        print(f"{'mode':<16} {'first issue':>12} {'all issues':>11} {'peak RSS':>12}")
+        for mode in ("get_team", "iter_team_issues"):
+            result = measure(mode, path, args.chunk_delay)
+            assert result["count"] == args.issues
+            print(
+                f"{mode:<16} {result['first'] * 1000:>9.1f} ms "
+                f"{result['total'] * 1000:>8.1f} ms {result['rss'] / 1024:>8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
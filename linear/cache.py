@@ -1,49 +1,239 @@
 import hashlib
 import json
 import os
+import pickle
+import threading
 import time
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Protocol
+from typing import Callable, ContextManager, Iterable, Iterator, Protocol
 
 
 class Cache(Protocol):
     def get(self, key: str) -> dict | None: ...
 
-    def set(self, key: str, data: dict): ...
+    def set(self, key: str, data: dict, ttl: int | None = None): ...
+
+    def writer(self, key: str) -> ContextManager[Callable[[bytes], None]]: ...
+
+    def invalidate(self, ids: Iterable[str]) -> int: ...
+
+
+CACHE_FORMAT_VERSION = 1
+"""Version of the on-disk format, bumped on incompatible changes."""
+_MAGIC = b"LICACHE"
+_CODEC_JSON = 0
+_CODEC_PICKLE = 1
+_UNCOMPRESSED = 0x80
+"""Flag set in the codec byte of entries stored without compression."""
+COMPRESS_MIN_SIZE = 4096
+"""Payloads smaller than this are stored uncompressed even with `compress`."""
+COMPRESS_LEVEL = 6
+
+
+def encode(data: dict, preparsed: bool = False, compress: bool = False) -> bytes:
+    """
+    Encode a cache entry in the compact on-disk format.
+
+    The entry is a header (magic, format version and codec) followed by the
+    payload. The payload is compact JSON, or with `preparsed` a pickle of the
+    parsed response dict, which loads about three times faster than JSON.
+    Models are still built from the dict on every load.
+
+    With `compress` the payload is zlib compressed, which makes entries about
+    eight times smaller but adds the decompression to every load. Small
+    payloads, where compression saves little, are always stored as they are.
+    """
+    if preparsed:
+        codec = _CODEC_PICKLE
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        codec = _CODEC_JSON
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    if not compress or len(payload) < COMPRESS_MIN_SIZE:
+        return _MAGIC + bytes([CACHE_FORMAT_VERSION, codec | _UNCOMPRESSED]) + payload
+    header = _MAGIC + bytes([CACHE_FORMAT_VERSION, codec])
+    return header + zlib.compress(payload, level=COMPRESS_LEVEL)
+
+
+def _decompress(raw: bytes) -> tuple[int, bytes] | None:
+    """
+    The codec and the uncompressed payload of a cache entry written by `encode`.
+    """
+    header_size = len(_MAGIC) + 2
+    if not raw.startswith(_MAGIC) or len(raw) < header_size:
+        return None
+    version, codec = raw[len(_MAGIC)], raw[len(_MAGIC) + 1]
+    if version != CACHE_FORMAT_VERSION:
+        return None
+    if codec & _UNCOMPRESSED:
+        return codec & ~_UNCOMPRESSED, raw[header_size:]
+    try:
+        return codec, zlib.decompress(raw[header_size:])
+    except zlib.error:
+        return None
+
+
+def decode(raw: bytes, preparsed: bool = False) -> dict | None:
+    """
+    Decode a cache entry written by `encode`.
+
+    Pickled entries are only loaded when `preparsed` is set, unpickling
+    must be opted into like writing pickles is.
+
+    Returns None for entries written with an unknown format version or codec,
+    for pickled entries without `preparsed`, and for truncated entries.
+    """
+    if (entry := _decompress(raw)) is None:
+        return None
+    codec, payload = entry
+    try:
+        if codec == _CODEC_JSON:
+            return json.loads(payload)
+        if codec == _CODEC_PICKLE and preparsed:
+            return pickle.loads(payload)
+    except (ValueError, EOFError, pickle.UnpicklingError):
+        pass
+    return None
 
 
 class XDGCache(Cache):
     """
     A simple cache implementation that stores data in the XDG_CACHE_HOME directory.
+
+    Entries are stored in the compact format produced by `encode`. The plain
+    JSON entries of earlier versions, which were keyed on the query alone, are
+    removed the first time the cache directory is used.
+
+    Entries expire after `ttl` seconds, unless invalidated earlier. A `ttl`
+    passed to `set` is a minimum: entries that should live longer than the
+    cache's own ttl are written with a modification time ahead of the current
+    time by the difference, they never expire earlier than other entries.
     """
 
-    def __init__(self, app_name: str):
+    def __init__(
+        self,
+        app_name: str,
+        preparsed: bool = False,
+        ttl: int = 30,
+        compress: bool = False,
+    ):
         self._cache_dir = Path(
             os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"), app_name
         )
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._preparsed = preparsed
+        self._compress = compress
+        self._ttl = ttl
+        self._remove_legacy_entries()
 
     def get(self, key: str) -> dict | None:
-        return self._query_cache_load(key)
+        return self._query_cache_load(key, ttl=self._ttl)
+
+    def set(self, key: str, data: dict, ttl: int | None = None):
+        self._query_cache_dump(key, data, ttl=max(ttl or 0, self._ttl))
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[Callable[[bytes], None]]:
+        """
+        Store a JSON response chunk by chunk as it is received, without
+        decoding it or holding it in memory.
+
+        Yields a function that appends a chunk of the response. The entry is
+        only stored if the block completes, an exception discards it.
+        """
+        cache_file = self._query_cache_file(key)
+        tmp_file = self._tmp_file(cache_file)
+        compressor = zlib.compressobj(COMPRESS_LEVEL) if self._compress else None
+        codec = _CODEC_JSON if compressor else _CODEC_JSON | _UNCOMPRESSED
+        try:
+            with tmp_file.open("wb") as f:
+                f.write(_MAGIC + bytes([CACHE_FORMAT_VERSION, codec]))
+
+                def write(chunk: bytes):
+                    f.write(compressor.compress(chunk) if compressor else chunk)
+
+                yield write
+                if compressor:
+                    f.write(compressor.flush())
+            tmp_file.replace(cache_file)
+        finally:
+            tmp_file.unlink(missing_ok=True)
 
-    def set(self, key: str, data: dict):
-        self._query_cache_dump(key, data)
+    def invalidate(self, ids: Iterable[str]) -> int:
+        """
+        Remove every entry that mentions any of the given ids.
+
+        Entries are matched on their raw payload, so this finds an issue in
+        the response of any query that returned it.
+
+        Returns:
+            The number of removed entries.
+        """
+        needles = [value.encode("utf-8") for value in ids if value]
+        if not needles:
+            return 0
+        removed = 0
+        for file in self._cache_dir.glob("*.bin"):
+            try:
+                raw = file.read_bytes()
+            except FileNotFoundError:
+                continue
+            entry = _decompress(raw)
+            payload = entry[1] if entry else b""
+            if any(needle in payload for needle in needles):
+                file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _remove_legacy_entries(self):
+        """
+        Remove the entries of earlier versions once, a marker file records
+        that the directory has been cleaned up.
+        """
+        marker = Path(self._cache_dir, f".format-{CACHE_FORMAT_VERSION}")
+        if marker.exists():
+            return
+        for file in self._cache_dir.glob("*.json"):
+            file.unlink(missing_ok=True)
+        marker.touch()
 
     def _query_cache_file(self, query: str) -> Path:
         query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
-        return Path(self._cache_dir, f"{query_hash}.json")
+        return Path(self._cache_dir, f"{query_hash}.bin")
 
     def _query_cache_load(self, query: str, ttl: int = 30) -> dict | None:
         cache_file = self._query_cache_file(query)
-        if not cache_file.exists():
-            return None
-        creation_time = cache_file.stat().st_mtime
-        if time.time() - creation_time > ttl:
-            cache_file.unlink()
+        # Entries may be removed at any time by another process, e.g. the
+        # webhook listener or the prefetcher.
+        try:
+            creation_time = cache_file.stat().st_mtime
+            if time.time() - creation_time > ttl:
+                cache_file.unlink(missing_ok=True)
+                return None
+            raw = cache_file.read_bytes()
+        except FileNotFoundError:
             return None
-        return json.loads(cache_file.read_text())
+        if (data := decode(raw, preparsed=self._preparsed)) is not None:
+            return data
+        cache_file.unlink(missing_ok=True)
+        return None
 
-    def _query_cache_dump(self, query: str, data: dict):
-        cache_file = self._query_cache_file(query)
+    @staticmethod
+    def _tmp_file(cache_file: Path) -> Path:
+        # Entries are written to a temporary file first and then moved into
+        # place, readers never see a partial entry.
         cache_file.parent.mkdir(parents=True, exist_ok=True)
-        cache_file.write_text(json.dumps(data))
+        return cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _query_cache_dump(self, query: str, data: dict, ttl: int = 30):
+        cache_file = self._query_cache_file(query)
+        tmp_file = self._tmp_file(cache_file)
+        tmp_file.write_bytes(
+            encode(data, preparsed=self._preparsed, compress=self._compress)
+        )
+        if ttl > self._ttl:
+            mtime = time.time() + ttl - self._ttl
+            os.utime(tmp_file, (mtime, mtime))
+        tmp_file.replace(cache_file)
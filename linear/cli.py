@@ -2,20 +2,23 @@ import logging
 import os
 import sys
 import webbrowser
+from pathlib import Path
 from typing import Optional
 
 import click
 
-from .cache import XDGCache
-from .client import ISSUE_STATES, LinearClient
+from .client import ISSUE_STATES, Issue, LinearClient, Team
+from .prefetch import PREFETCH_TTL
+from .prefetch import spawn as spawn_prefetch
 from .printer import LinearPrinter
+from .profiles import Profile, load_profiles, map_profiles, select_profile
+from .stats import IssueColumns, TeamStats
+from .webhook import WebhookServer, replay_deliveries
 
 LOGGER = logging.getLogger(__name__)
-LINEAR_CLIENT = LinearClient(
-    url="https://api.linear.app/graphql",
-    api_key=os.environ["LINEAR_API_KEY"],
-    cache=XDGCache(app_name="linear"),
-)
+PROFILES = load_profiles()
+PROFILE = select_profile(PROFILES, os.environ.get("LINEAR_PROFILE"))
+LINEAR_CLIENT = PROFILE.client
 
 
 def setup_logging():
@@ -29,30 +32,159 @@ def setup_logging():
     LOGGER.debug("Debug mode enabled")
 
 
-@click.command("team")
+prefetch_option = click.option(
+    "--prefetch",
+    is_flag=True,
+    envvar="LINEAR_PREFETCH",
+    help="Keep the listed issues' details cached, fetching them in the background.",
+)
+pager_option = click.option(
+    "--pager",
+    is_flag=True,
+    envvar="LINEAR_PAGER",
+    help="Page through the output, rendering it only as far as it is viewed.",
+)
+all_profiles_option = click.option(
+    "--all-profiles",
+    is_flag=True,
+    help="Query all workspace profiles in parallel and merge the results.",
+)
+
+
+def command_profiles(all_profiles: bool) -> list[Profile]:
+    return list(PROFILES.values()) if all_profiles else [PROFILE]
+
+
+def assigned_issues(
+    client: LinearClient, issue_states: list[str], prefetch: bool = False
+) -> list[Issue]:
+    """
+    The issues assigned to you with their details. With `prefetch` the
+    details stay cached as long as prefetched ones do.
+    """
+    me = client.get_me()
+
+    if me.assigned_issues is None:
+        return []
+
+    cache_ttl = PREFETCH_TTL if prefetch else None
+    return [
+        # I need to fetch the issue to be able to load sub issues
+        client.get_issue(issue.id, cache_ttl=cache_ttl)
+        for issue in me.assigned_issues
+        if issue.state.type in issue_states
+    ]
+
+
+def team_issues(
+    client: LinearClient, issue_states: list[str]
+) -> list[tuple[Team, list[Issue]]]:
+    me = client.get_me()
+    return [
+        (
+            team,
+            [
+                issue
+                for issue in client.iter_team_issues(team.id)
+                if issue.state.type in issue_states
+            ],
+        )
+        for team in me.teams or []
+    ]
+
+
+@click.group("team", invoke_without_command=True)
 @click.option("--json", is_flag=True)
 @click.option("--state", type=click.Choice(ISSUE_STATES), default=None)
-def cmd_team(state: Optional[str], json: bool):
+@prefetch_option
+@all_profiles_option
+@pager_option
+@click.pass_context
+def cmd_team(
+    ctx: click.Context,
+    state: Optional[str],
+    json: bool,
+    prefetch: bool,
+    all_profiles: bool,
+    pager: bool,
+):
     """
     linear team
+
+    With --pager the issues are shown in the order they are received, the
+    listing opens before the teams have been downloaded completely.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
+    if pager and (json or all_profiles):
+        raise click.UsageError(
+            "--pager can't be combined with --json or --all-profiles"
+        )
+
+    issue_states = [state] if state else ISSUE_STATES
+    if pager:
+        me = LINEAR_CLIENT.get_me()
+        if not me.teams:
+            LOGGER.error("You are not a member of any teams")
+            sys.exit(1)
+
+        shown = []
+
+        def streamed_issues():
+            for team in me.teams or []:
+                for issue in LINEAR_CLIENT.iter_team_issues(team.id):
+                    if issue.state.type in issue_states:
+                        shown.append(issue.identifier)
+                        yield issue
+
+        LinearPrinter(format="markdown", paged=True).print_issues(streamed_issues())
+        if prefetch:
+            spawn_prefetch(shown)
+        return
+
+    results = map_profiles(
+        command_profiles(all_profiles),
+        lambda profile: team_issues(profile.client, issue_states),
+    )
+    if not any(teams for _, teams in results):
+        LOGGER.error("You are not a member of any teams")
+        sys.exit(1)
+
+    printer = LinearPrinter(format="json" if json else "markdown")
+    for profile, teams in results:
+        listed = []
+        for _, team_issue_list in teams:
+            issues = sorted(team_issue_list, key=lambda issue: issue.state.name)
+            printer.print_issues(issues)
+            listed.extend(issue.identifier for issue in issues)
+        if prefetch:
+            # One process per workspace, so that the rate and issue limits
+            # apply to the whole listing rather than to every team.
+            spawn_prefetch(listed, profile=profile.name)
+
+
+@cmd_team.command("stats")
+@click.option("--json", is_flag=True)
+@click.option("--weeks", type=int, default=12, help="Weeks of throughput to show.")
+def cmd_team_stats(json: bool, weeks: int):
+    """
+    Throughput and cycle time of your teams over their full issue history
     """
     me = LINEAR_CLIENT.get_me()
     if not me.teams:
         LOGGER.error("You are not a member of any teams")
         sys.exit(1)
 
-    issue_states = [state] if state else ISSUE_STATES
-
+    printer = LinearPrinter(format="json" if json else "markdown")
     for team in me.teams:
-        team_issues = LINEAR_CLIENT.get_team(team.id).issues
-        issues = sorted(
-            [issue for issue in team_issues if issue.state.type in issue_states],
-            key=lambda issue: issue.state.name,
-        )
-        printer = LinearPrinter(
-            format="json" if json else "markdown",
-        )
-        printer.print_issues(issues)
+        nodes = [
+            node
+            for page in LINEAR_CLIENT.iter_team_issue_history(team.id)
+            for node in page
+        ]
+        stats = TeamStats.from_columns(team.name, IssueColumns.from_nodes(nodes))
+        printer.print_team_stats(stats, weeks=weeks)
 
 
 @click.group("issue")
@@ -65,24 +197,19 @@ def cmd_issue():
 @cmd_issue.command("list")
 @click.option("--state", type=click.Choice(ISSUE_STATES), default=None)
 @click.option("--json", is_flag=True)
-def cmd_issue_list(state: str, json: bool):
+@prefetch_option
+@all_profiles_option
+def cmd_issue_list(state: str, json: bool, prefetch: bool, all_profiles: bool):
     """
     List linear issues assigned to you
     """
     issue_states = [state] if state else ["backlog", "started", "unstarted"]
-    me = LINEAR_CLIENT.get_me()
-
-    if me.assigned_issues is None:
-        # print("No issues assigned to you")
-        return
-
+    results = map_profiles(
+        command_profiles(all_profiles),
+        lambda profile: assigned_issues(profile.client, issue_states, prefetch),
+    )
     issues = sorted(
-        [
-            # I need to fetch the issue to be able to load sub issues
-            LINEAR_CLIENT.get_issue(issue.id)
-            for issue in me.assigned_issues
-            if issue.state.type in issue_states
-        ],
+        [issue for _, profile_issues in results for issue in profile_issues],
         key=lambda issue: issue.state.name,
     )
     format = "json" if json else "markdown"
@@ -104,7 +231,8 @@ def complete_issue_id(ctx, param, incomplete):
 @click.argument("issue_id", type=str, shell_complete=complete_issue_id)
 @click.option("--web", is_flag=True)
 @click.option("--json", is_flag=True)
-def cmd_issue_view(issue_id: str, web: bool, json: bool):
+@pager_option
+def cmd_issue_view(issue_id: str, web: bool, json: bool, pager: bool):
     """
     linear issue view <issue_id>
 
@@ -120,6 +248,9 @@ def cmd_issue_view(issue_id: str, web: bool, json: bool):
         else:
             return issue_id
 
+    if pager and json:
+        raise click.UsageError("--pager can't be combined with --json")
+
     issue_id = get_issue_id(issue_id)
 
     issue = LINEAR_CLIENT.get_issue(issue_id)
@@ -127,7 +258,7 @@ def cmd_issue_view(issue_id: str, web: bool, json: bool):
         webbrowser.open(issue.url)
         return
 
-    printer = LinearPrinter(format="json" if json else "markdown")
+    printer = LinearPrinter(format="json" if json else "markdown", paged=pager)
     printer.print_issue(issue)
 
 
@@ -161,30 +292,86 @@ def cmd_me(state: str, json: bool):
 @click.command("ls")
 @click.option("--state", type=click.Choice(ISSUE_STATES), default=None)
 @click.option("--json", is_flag=True)
-def cmd_ls(state: str, json: bool):
+@prefetch_option
+@all_profiles_option
+def cmd_ls(state: str, json: bool, prefetch: bool, all_profiles: bool):
     """
     List linear issues assigned to you
     """
     issue_states = [state] if state else ["backlog", "started", "unstarted"]
-    me = LINEAR_CLIENT.get_me()
-
-    if me.assigned_issues is None:
-        # print("No issues assigned to you")
-        return
-
+    results = map_profiles(
+        command_profiles(all_profiles),
+        lambda profile: assigned_issues(profile.client, issue_states, prefetch),
+    )
     issues = sorted(
-        [
-            # I need to fetch the issue to be able to load sub issues
-            LINEAR_CLIENT.get_issue(issue.id)
-            for issue in me.assigned_issues
-            if issue.state.type in issue_states
-        ],
+        [issue for _, profile_issues in results for issue in profile_issues],
         key=lambda issue: issue.state.name,
     )
     printer = LinearPrinter(format="json" if json else "markdown")
     printer.print_issues(issues)
 
 
+@click.command("listen")
+@click.option("--host", default="127.0.0.1")
+@click.option("--port", type=int, default=8765)
+@click.option(
+    "--secret",
+    help="Signing secret of the current profile's webhook, overrides the "
+    "configured one.",
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Append every accepted delivery to this NDJSON file.",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Send recorded deliveries to the listener at --host/--port and exit.",
+)
+def cmd_listen(
+    host: str,
+    port: int,
+    secret: Optional[str],
+    record: Optional[Path],
+    replay: Optional[Path],
+):
+    """
+    Invalidate cached data when Linear sends webhook events
+
+    Point a Linear webhook at this listener (through a tunnel if needed) and
+    raise LINEAR_CACHE_TTL, cached data stays fresh without polling. Every
+    profile with a webhook secret is listened for.
+    """
+    if replay:
+        accepted = replay_deliveries(replay, f"http://{host}:{port}/")
+        LOGGER.info("Replayed %d deliveries", accepted)
+        return
+
+    secrets = {
+        profile.name: profile.webhook_secret
+        for profile in PROFILES.values()
+        if profile.webhook_secret
+    }
+    if secret:
+        secrets[PROFILE.name] = secret
+    if not secrets:
+        raise click.UsageError(
+            "No webhook secret configured, pass --secret or set "
+            "LINEAR_WEBHOOK_SECRET or webhook_secret in the profiles"
+        )
+    clients = {secret: PROFILES[name].client for name, secret in secrets.items()}
+    server = WebhookServer((host, port), clients, record=record)
+    LOGGER.info("Invalidating the cache of profiles %s", ", ".join(secrets))
+    LOGGER.info("Listening for Linear webhooks on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 @click.group()
 def cli():
     setup_logging()
@@ -194,5 +381,6 @@ cli.add_command(cmd_issue)
 cli.add_command(cmd_team)
 cli.add_command(cmd_me)
 cli.add_command(cmd_ls)
+cli.add_command(cmd_listen)
 if __name__ == "__main__":
     cli()
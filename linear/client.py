@@ -1,11 +1,13 @@
 from __future__ import annotations
+import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
-
-import requests
+from functools import cached_property
+from typing import Callable, Iterable, Iterator, Optional
 
 from .cache import Cache
+from .jsonstream import NodeStream, decode_utf8
+from .transport import LiveTransport, Transport
 
 ISSUE_STATES = [
     "backlog",
@@ -16,6 +18,100 @@ ISSUE_STATES = [
 ]
 
 
+GET_TEAM_QUERY = """
+query GetTeam($team_id: String!) {
+    team(id: $team_id) {
+        id
+        name
+        issues {
+            nodes {
+                id
+                identifier
+                title
+                createdAt
+                description
+                url
+                assignee {
+                    id
+                    name
+                    email
+                }
+                state {
+                    id
+                    name
+                    type
+                }
+            }
+        }
+    }
+}
+"""
+GET_ISSUE_QUERY = """
+query GetIssue($issue_id: String!) {
+    issue(id: $issue_id) {
+        id
+        identifier
+        title
+        createdAt
+        description
+        url
+        assignee {
+            id
+            name
+            email
+        }
+        state {
+            id
+            name
+            type
+        }
+        comments {
+            nodes {
+                id
+                body
+                createdAt
+                user {
+                    name
+                }
+                parent {
+                    id
+                }
+            }
+        }
+        attachments {
+            nodes {
+                id
+                title
+                url
+                sourceType
+            }
+        }
+        children {
+            nodes {
+                id
+                identifier
+                title
+                createdAt
+                description
+                url
+                assignee {
+                    id
+                    name
+                    email
+                }
+                state {
+                    id
+                    name
+                    type
+                }
+            }
+        }
+    }
+}
+"""
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
 @dataclass
 class LinearErrorMessage:
     message: str
@@ -117,6 +213,22 @@ class Issue:
     assignee: Optional[User] = None
     attachments: Optional[list[Attachment]] = None
 
+    @cached_property
+    def comment_tree(self) -> dict[Optional[str], list[Comment]]:
+        """
+        Comments indexed by their parent id, oldest first.
+
+        Top-level comments are stored under ``None``. Replies whose parent is
+        not part of the issue's comments are treated as top-level comments.
+        """
+        comments = sorted(self.comments or [], key=lambda x: x.created_at)
+        comment_ids = {comment.id for comment in comments}
+        tree: dict[Optional[str], list[Comment]] = {}
+        for comment in comments:
+            parent_id = comment.parent_id if comment.parent_id in comment_ids else None
+            tree.setdefault(parent_id, []).append(comment)
+        return tree
+
     @classmethod
     def from_dict(cls, issue: dict) -> Issue:
         has_children = "children" in issue
@@ -200,10 +312,11 @@ class LinearClient:
         url: str,
         api_key: str,
         cache: Cache,
+        transport: Optional[Transport] = None,
     ):
         self._base_url = url
         self._api_key = api_key
-        self._session = requests.Session()
+        self._transport = transport or LiveTransport()
         self._cache = cache
 
     def get_me(self) -> User:
@@ -242,108 +355,101 @@ class LinearClient:
         data = self._gql_request(query)
         return User.from_dict(data["data"]["viewer"])
 
-    def get_issue(self, issue_id: str) -> Issue:
-        query = """
-        query GetIssue($issue_id: String!) {
-            issue(id: $issue_id) {
-                id
-                identifier
-                title
-                createdAt
-                description
-                url
-                assignee {
-                    id
-                    name
-                    email
-                }
-                state {
-                    id
-                    name
-                    type
-                }
-                comments {
-                    nodes {
-                        id
-                        body
-                        createdAt
-                        user {
-                            name
-                        }
-                        parent {
-                            id
-                        }
-                    }
-                }
-                attachments {
-                    nodes {
-                        id
-                        title
-                        url
-                        sourceType
-                    }
-                }
-                children {
-                    nodes {
-                        id
-                        identifier
-                        title
-                        createdAt
-                        description
-                        url
-                        assignee {
-                            id
-                            name
-                            email
-                        }
-                        state {
-                            id
-                            name
-                            type
-                        }
-                    }
-                }
-            }
-        }
+    def get_issue(self, issue_id: str, cache_ttl: Optional[int] = None) -> Issue:
         """
-        data = self._gql_request(query, issue_id=issue_id)
+        Fetch an issue by id or identifier.
+
+        A fetched response is cached under both the issue's id and its
+        identifier, so it is found again whichever of the two is asked for.
+
+        Args:
+            issue_id: The issue's id or identifier, e.g. ENG-123.
+            cache_ttl: Minimum number of seconds to cache a fetched response
+                for, it is never cached for less than the cache's own ttl.
+        """
+        cache_key = self._cache_key(GET_ISSUE_QUERY, {"issue_id": issue_id})
+        if not (data := self._cache.get(cache_key)):
+            data = self._gql_fetch(GET_ISSUE_QUERY, issue_id=issue_id)
+            node = data["data"]["issue"]
+            for alias in dict.fromkeys([issue_id, node["id"], node["identifier"]]):
+                self._cache.set(
+                    self._cache_key(GET_ISSUE_QUERY, {"issue_id": alias}),
+                    data,
+                    ttl=cache_ttl,
+                )
         return Issue.from_dict(data["data"]["issue"])
 
     def get_team(self, team_id: str) -> Team:
+        gql_data = self._gql_request(GET_TEAM_QUERY, team_id=team_id)["data"]
+        return Team.from_dict(gql_data)
+
+    def iter_team_issues(self, team_id: str) -> Iterator[Issue]:
+        """
+        The team's issues, yielded while the response is still being received.
+        """
+        for node in self._gql_stream(GET_TEAM_QUERY, team_id=team_id):
+            yield Issue.from_dict(node)
+
+    def invalidate(self, ids: Iterable[str]) -> int:
+        """
+        Drop all cached responses that mention any of the given ids.
+
+        Returns:
+            The number of dropped responses.
+        """
+        return self._cache.invalidate(ids)
+
+    def iter_team_issue_history(
+        self, team_id: str, page_size: int = 250
+    ) -> Iterator[list[dict]]:
+        """
+        Fetch the timestamps, state and assignee of all of a team's issues,
+        including archived ones, one page at a time.
+
+        The team and issue ids are requested too, so that webhook events for
+        the team or any of its issues invalidate the cached pages.
+
+        Yields the raw issue nodes of each page.
+        """
         query = """
-        query GetTeam($team_id: String!) {
+        query GetTeamIssueHistory($team_id: String!, $first: Int!, $after: String) {
             team(id: $team_id) {
                 id
-                name
-                issues {
+                issues(first: $first, after: $after, includeArchived: true) {
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
                     nodes {
                         id
-                        identifier
-                        title
                         createdAt
-                        description
-                        url
-                        assignee {
-                            id
-                            name
-                            email
-                        }
+                        startedAt
+                        completedAt
                         state {
-                            id
-                            name
                             type
                         }
+                        assignee {
+                            name
+                        }
                     }
                 }
             }
         }
         """
-        gql_data = self._gql_request(query, team_id=team_id)["data"]
-        return Team.from_dict(gql_data)
+        cursor = None
+        while True:
+            issues = self._gql_request(
+                query, team_id=team_id, first=page_size, after=cursor
+            )["data"]["team"]["issues"]
+            yield issues["nodes"]
+            if not issues["pageInfo"]["hasNextPage"]:
+                return
+            cursor = issues["pageInfo"]["endCursor"]
 
     def _gql_request(self, query: str, **variables) -> dict:
         """
-        Send a GraphQL query to Linear and return the response as a dictionary.
+        Send a GraphQL query to Linear and return the response as a dictionary,
+        served from the cache if possible.
         Args:
             query (str): The GraphQL query to send to Linear.
         Returns:
@@ -351,9 +457,20 @@ class LinearClient:
         Raises:
             LinearRequestError: If the query was invalid.
         """
-        if data := self._cache.get(query):
+        cache_key = self._cache_key(query, variables)
+        if data := self._cache.get(cache_key):
             return data
-        response = self._session.post(
+        data = self._gql_fetch(query, **variables)
+        self._cache.set(cache_key, data)
+        return data
+
+    def _gql_fetch(self, query: str, **variables) -> dict:
+        """
+        Send a GraphQL query to Linear, bypassing the cache.
+        Raises:
+            LinearRequestError: If the query was invalid.
+        """
+        response = self._transport.post(
             self._base_url,
             headers={"Authorization": self._api_key},
             json={"query": query, "variables": variables},
@@ -363,5 +480,68 @@ class LinearClient:
             raise LinearRequestError(
                 [LinearErrorMessage.from_gql(error) for error in data["errors"]]
             )
-        self._cache.set(query, data)
         return data
+
+    def _gql_stream(self, query: str, **variables) -> Iterator[dict]:
+        """
+        Send a GraphQL query to Linear and yield the items of the first `nodes`
+        list in the response as soon as each one has been received.
+
+        The response is written to the cache as it is received, the complete
+        response is never held in memory.
+        Raises:
+            LinearRequestError: If the query was invalid.
+        """
+        cache_key = self._cache_key(query, variables)
+        if data := self._cache.get(cache_key):
+            yield from _first_nodes(data) or []
+            return
+        with (
+            self._transport.post(
+                self._base_url,
+                headers={"Authorization": self._api_key},
+                json={"query": query, "variables": variables},
+                stream=True,
+            ) as response,
+            self._cache.writer(cache_key) as store,
+        ):
+            chunks = _stored(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), store)
+            stream = NodeStream(decode_utf8(chunks))
+            yield from stream
+            # Raising discards the cache entry.
+            if "errors" in stream.document:
+                raise LinearRequestError(
+                    [
+                        LinearErrorMessage.from_gql(error)
+                        for error in stream.document["errors"]
+                    ]
+                )
+
+    @staticmethod
+    def _cache_key(query: str, variables: dict) -> str:
+        """
+        Cache key for a query, distinct for every set of variables.
+        """
+        return query + json.dumps(variables, sort_keys=True)
+
+
+def _stored(chunks: Iterable[bytes], store: Callable[[bytes], None]) -> Iterator[bytes]:
+    """
+    Pass the chunks through, storing each one on the way.
+    """
+    for chunk in chunks:
+        store(chunk)
+        yield chunk
+
+
+def _first_nodes(data: dict | list) -> Optional[list]:
+    """
+    The first `nodes` list in a response, in document order.
+    """
+    items = data.items() if isinstance(data, dict) else enumerate(data)
+    for key, item in items:
+        if key == "nodes" and isinstance(item, list):
+            return item
+        if isinstance(item, (dict, list)) and (nodes := _first_nodes(item)) is not None:
+            return nodes
+    return None
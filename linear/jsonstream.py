@@ -0,0 +1,106 @@
+"""
+Incremental decoding of the `nodes` list of a GraphQL response.
+
+Connections in Linear's API return their items in a `nodes` list. For large
+responses the items can be decoded one by one while the response is still
+being downloaded, instead of buffering and decoding the whole body first.
+"""
+
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, Optional
+
+_NODES = re.compile(r'"nodes"\s*:\s*\[')
+_WHITESPACE = " \t\n\r"
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def decode_utf8(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Decode a stream of UTF-8 bytes, characters may be split across chunks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        if text := decoder.decode(chunk):
+            yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
+class NodeStream:
+    """
+    Iterates over the items of the first `nodes` list in a JSON document.
+
+    Once the iteration has finished, `document` holds the rest of the
+    document with that list left empty.
+
+    Example:
+        stream = NodeStream(decode_utf8(response.iter_content(65536)))
+        for node in stream:
+            ...
+        errors = stream.document.get("errors")
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self.document: dict = {}
+
+    def _read(self) -> Optional[str]:
+        return next(self._chunks, None)
+
+    def __iter__(self) -> Iterator[dict]:
+        buffer = ""
+        while (match := _NODES.search(buffer)) is None:
+            chunk = self._read()
+            if chunk is None:
+                # No nodes in the document, e.g. an error response.
+                self.document = json.loads(buffer)
+                return
+            buffer += chunk
+
+        prefix = buffer[: match.end()]
+        buffer = buffer[match.end() :]
+        position = 0
+        while True:
+            position = _skip_whitespace(buffer, position)
+            if position == len(buffer):
+                chunk = self._read()
+                if chunk is None:
+                    raise json.JSONDecodeError("Unterminated nodes", buffer, position)
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            if buffer[position] == "]":
+                break
+            if buffer[position] == ",":
+                position += 1
+                continue
+            try:
+                node, end = self._decoder.raw_decode(buffer, position)
+                end = _skip_whitespace(buffer, end)
+            except json.JSONDecodeError:
+                end = None
+            if end is None or end == len(buffer):
+                # The node is not complete yet, or it is a number that may
+                # continue in the next chunk.
+                chunk = self._read()
+                if chunk is None:
+                    # Raises the decoding error of an invalid node.
+                    self._decoder.raw_decode(buffer, position)
+                    raise json.JSONDecodeError("Unterminated nodes", buffer, end or 0)
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            if buffer[end] not in ",]":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+            yield node
+            # Drop the decoded text so that the buffer stays small.
+            buffer, position = buffer[end:], 0
+
+        rest = "".join([buffer[position:], *self._chunks])
+        self.document = json.loads(prefix + rest)
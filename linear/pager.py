@@ -0,0 +1,98 @@
+"""
+A minimal pager that renders its input lazily.
+
+The text is pulled from an iterator only as far as the viewport needs it,
+plus one screenful ahead. Quitting the pager closes the iterator, so the
+remaining output is never rendered and pending downloads are cancelled.
+"""
+
+import math
+import re
+import shutil
+import sys
+from collections import deque
+from typing import Iterable, Iterator, Optional, TextIO
+
+import click
+
+QUIT_KEYS = {"q", "Q", "\x03", "\x1b"}
+LINE_KEYS = {"\r", "\n", "j"}
+PROMPT = "\x1b[7m--More--\x1b[0m"
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def _lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split chunks of text into lines, keeping the line endings.
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield f"{line}\n"
+    if pending:
+        yield pending
+
+
+def screen_rows(line: str, columns: int) -> int:
+    """
+    Number of terminal rows a line takes up once wrapped at `columns`.
+    """
+    visible = _ANSI_ESCAPE.sub("", line).rstrip("\n").expandtabs()
+    return max(1, math.ceil(len(visible) / columns))
+
+
+def page(chunks: Iterable[str], file: Optional[TextIO] = None):
+    """
+    Show the text one screenful at a time.
+
+    Space shows the next screen, Enter or j the next line, q quits. Long
+    lines are counted by the number of rows they wrap to. Output that does
+    not go to a terminal is written as it is produced.
+    """
+    file = file or sys.stdout
+    if not file.isatty():
+        for chunk in chunks:
+            file.write(chunk)
+            file.flush()
+        return
+
+    lines = _lines(chunks)
+    size = shutil.get_terminal_size()
+    height = max(size.lines - 1, 1)
+    columns = max(size.columns, 1)
+    # Rendered lines not shown yet, with the number of rows each one takes up.
+    lookahead: deque[tuple[str, int]] = deque()
+    lookahead_rows = 0
+    show = height
+    try:
+        while True:
+            while lookahead_rows < show + height:
+                if (line := next(lines, None)) is None:
+                    break
+                rows = screen_rows(line, columns)
+                lookahead.append((line, rows))
+                lookahead_rows += rows
+            shown = 0
+            # A line taller than the screen is still shown on its own.
+            while lookahead and (not shown or shown + lookahead[0][1] <= show):
+                line, rows = lookahead.popleft()
+                file.write(line)
+                shown += rows
+                lookahead_rows -= rows
+            if not lookahead:
+                return
+            file.write(PROMPT)
+            file.flush()
+            try:
+                key = click.getchar()
+            except KeyboardInterrupt:
+                key = "q"
+            file.write("\r\x1b[K")
+            if key in QUIT_KEYS:
+                return
+            show = 1 if key in LINE_KEYS else height
+    finally:
+        lines.close()
+        file.flush()
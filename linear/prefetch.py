@@ -0,0 +1,123 @@
+"""
+Background prefetching of issue details into the cache.
+
+Listing commands only know the issues' titles and states. Viewing one of them
+needs a separate `GetIssue` request, so after a listing has been printed the
+details can be fetched by a detached process and stored in the cache.
+
+    python -m linear.prefetch ENG-123 ENG-124
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from .client import LinearClient
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_ISSUES = 50
+"""Upper bound on the number of issues prefetched after a single command."""
+MAX_WORKERS = 4
+"""Number of requests in flight at the same time."""
+MAX_REQUESTS_PER_SECOND = 5.0
+PREFETCH_TTL = 300
+"""
+Minimum number of seconds prefetched issues stay cached, if LINEAR_CACHE_TTL
+is longer they are cached as long as other entries.
+"""
+INHERITED_ENV_EXCLUDES = {"LINEAR_RECORD", "LINEAR_REPLAY"}
+"""
+Not passed on to the prefetch process: its requests do not belong in the
+session's cassette, and a replayed session must not spend time prefetching.
+"""
+
+
+class RateLimiter:
+    """
+    Spaces out calls to `wait` so that at most `rate` calls pass per second.
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def prefetch_issues(
+    client: LinearClient,
+    issue_ids: Iterable[str],
+    max_workers: int = MAX_WORKERS,
+    rate: float = MAX_REQUESTS_PER_SECOND,
+):
+    """
+    Fetch the given issues through the client so that they end up in its cache.
+
+    Args:
+        client: The client to fetch the issues with.
+        issue_ids: Issue ids or identifiers, as they will later be requested.
+        max_workers: Number of concurrent requests.
+        rate: Maximum number of requests started per second.
+    """
+    limiter = RateLimiter(rate)
+
+    def fetch(issue_id: str):
+        limiter.wait()
+        try:
+            client.get_issue(issue_id, cache_ttl=PREFETCH_TTL)
+        except Exception:
+            LOGGER.debug("Failed to prefetch %s", issue_id, exc_info=True)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(fetch, issue_ids))
+
+
+def spawn(issue_ids: list[str], profile: Optional[str] = None):
+    """
+    Prefetch the issues in a detached process that outlives the current command.
+
+    Args:
+        issue_ids: Issue ids or identifiers to prefetch.
+        profile: Workspace profile the issues belong to, the current one if None.
+    """
+    issue_ids = list(dict.fromkeys(issue_ids))[:MAX_ISSUES]
+    if not issue_ids:
+        return
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in INHERITED_ENV_EXCLUDES
+    }
+    if profile:
+        env["LINEAR_PROFILE"] = profile
+    subprocess.Popen(
+        [sys.executable, "-m", __name__, *issue_ids],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main():
+    from .cli import LINEAR_CLIENT
+
+    prefetch_issues(LINEAR_CLIENT, sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Workspace profiles, one API key per Linear workspace.
+
+Profiles are read from `$XDG_CONFIG_HOME/linear/profiles.toml`:
+
+    [acme]
+    api_key = "lin_api_..."
+
+    [globex]
+    api_key_env = "GLOBEX_LINEAR_API_KEY"
+    webhook_secret_env = "GLOBEX_LINEAR_WEBHOOK_SECRET"
+
+`LINEAR_API_KEY`, when set, is available as the profile named "default", with
+the webhook signing secret from `LINEAR_WEBHOOK_SECRET`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from .cache import XDGCache
+from .client import LinearClient
+from .transport import transport_from_env
+
+LOGGER = logging.getLogger(__name__)
+
+LINEAR_API_URL = "https://api.linear.app/graphql"
+DEFAULT_PROFILE = "default"
+
+T = TypeVar("T")
+
+
+class ProfileError(Exception):
+    pass
+
+
+@dataclass
+class Profile:
+    name: str
+    api_key: str
+    webhook_secret: Optional[str] = None
+    """Signing secret of the workspace's webhook, used by `li listen`."""
+
+    @cached_property
+    def client(self) -> LinearClient:
+        """
+        A client for the profile's workspace, with its own connection pool and
+        its own cache directory.
+        """
+        app_name = "linear" if self.name == DEFAULT_PROFILE else f"linear/{self.name}"
+        return LinearClient(
+            url=LINEAR_API_URL,
+            api_key=self.api_key,
+            cache=XDGCache(
+                app_name=app_name,
+                preparsed=bool(os.environ.get("LINEAR_CACHE_PREPARSED")),
+                compress=bool(os.environ.get("LINEAR_CACHE_COMPRESS")),
+                ttl=int(os.environ.get("LINEAR_CACHE_TTL", 30)),
+            ),
+            transport=transport_from_env(workspace=self.name),
+        )
+
+
+def config_file() -> Path:
+    return Path(
+        os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"),
+        "linear",
+        "profiles.toml",
+    )
+
+
+def load_profiles() -> dict[str, Profile]:
+    """
+    Load the configured profiles, keyed by name.
+
+    Profiles without an API key, e.g. because their `api_key_env` variable is
+    not set, are skipped with a warning.
+    """
+    profiles = {}
+    if api_key := os.environ.get("LINEAR_API_KEY"):
+        profiles[DEFAULT_PROFILE] = Profile(
+            name=DEFAULT_PROFILE,
+            api_key=api_key,
+            webhook_secret=os.environ.get("LINEAR_WEBHOOK_SECRET"),
+        )
+
+    path = config_file()
+    if not path.exists():
+        return profiles
+    with path.open("rb") as f:
+        config = tomllib.load(f)
+    for name, settings in config.items():
+        api_key = _setting(settings, "api_key")
+        if not api_key:
+            LOGGER.warning("Skipping profile '%s' in %s, it has no API key", name, path)
+            continue
+        profiles[name] = Profile(
+            name=name,
+            api_key=api_key,
+            webhook_secret=_setting(settings, "webhook_secret"),
+        )
+    return profiles
+
+
+def _setting(settings: dict, name: str) -> Optional[str]:
+    """
+    A profile setting, given either directly or as the name of an environment
+    variable in `<name>_env`.
+    """
+    if f"{name}_env" in settings:
+        return os.environ.get(settings[f"{name}_env"])
+    return settings.get(name)
+
+
+def select_profile(profiles: dict[str, Profile], name: str | None = None) -> Profile:
+    """
+    The profile to use for single workspace commands: the named one, else
+    the default profile, else the first configured one.
+    """
+    if name:
+        if name not in profiles:
+            raise ProfileError(f"Unknown profile '{name}'")
+        return profiles[name]
+    if DEFAULT_PROFILE in profiles:
+        return profiles[DEFAULT_PROFILE]
+    if profiles:
+        return next(iter(profiles.values()))
+    raise ProfileError(
+        f"LINEAR_API_KEY is not set and no profiles are configured in {config_file()}"
+    )
+
+
+def map_profiles(
+    profiles: list[Profile], fn: Callable[[Profile], T]
+) -> list[tuple[Profile, T]]:
+    """
+    Call `fn` for every profile in parallel and return the results in the
+    order of `profiles`.
+    """
+    if not profiles:
+        return []
+    with ThreadPoolExecutor(max_workers=len(profiles)) as executor:
+        return list(zip(profiles, executor.map(fn, profiles)))
@@ -0,0 +1,159 @@
+"""
+Throughput and cycle time statistics over a team's issue history.
+
+The issues are turned into columns (one array per field) once, and all
+statistics are computed on those columns instead of on per-issue objects.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Iterable, Optional
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+# The epoch is a Thursday, weeks start on the Monday before it.
+_WEEK_OFFSET = 3 * DAY
+NAN = float("nan")
+
+
+def _timestamp(value: Optional[str]) -> float:
+    return datetime.fromisoformat(value).timestamp() if value else NAN
+
+
+@dataclass
+class IssueColumns:
+    """
+    The fields of a list of issues needed for the statistics, column by column.
+
+    Timestamps are seconds since the epoch, NaN where not set.
+    """
+
+    created_at: array
+    started_at: array
+    completed_at: array
+    state_type: list[str]
+    assignee: list[Optional[str]]
+
+    @classmethod
+    def from_nodes(cls, nodes: list[dict]) -> IssueColumns:
+        return cls(
+            created_at=array("d", map(_timestamp, (n["createdAt"] for n in nodes))),
+            started_at=array("d", map(_timestamp, (n["startedAt"] for n in nodes))),
+            completed_at=array("d", map(_timestamp, (n["completedAt"] for n in nodes))),
+            state_type=[n["state"]["type"] for n in nodes],
+            assignee=[n["assignee"]["name"] if n["assignee"] else None for n in nodes],
+        )
+
+
+@dataclass
+class DurationStats:
+    """Distribution of a duration, in days."""
+
+    count: int
+    mean: float
+    p50: float
+    p75: float
+    p90: float
+
+    @classmethod
+    def from_seconds(cls, durations: Iterable[float]) -> Optional[DurationStats]:
+        values = sorted(durations)
+        if not values:
+            return None
+        return cls(
+            count=len(values),
+            mean=math.fsum(values) / len(values) / DAY,
+            p50=percentile(values, 50) / DAY,
+            p75=percentile(values, 75) / DAY,
+            p90=percentile(values, 90) / DAY,
+        )
+
+
+@dataclass
+class TeamStats:
+    team_name: str
+    issue_count: int
+    state_counts: dict[str, int]
+    """Number of issues per workflow state type."""
+    assignee_counts: dict[str, int]
+    """Number of completed issues per assignee."""
+    cycle_time: Optional[DurationStats]
+    """Time from started to completed."""
+    lead_time: Optional[DurationStats]
+    """Time from created to completed."""
+    weekly_throughput: dict[str, int]
+    """
+    Number of completed issues per week, keyed by the week's Monday. Every
+    week from the first completion up to the current week is included, weeks
+    without completions with a count of 0.
+    """
+
+    @classmethod
+    def from_columns(
+        cls, team_name: str, columns: IssueColumns, now: Optional[float] = None
+    ) -> TeamStats:
+        """
+        Args:
+            team_name: Name of the team the issues belong to.
+            columns: The team's issues.
+            now: Timestamp the weekly throughput ends at, the current time if
+                None.
+        """
+        created, started, completed = (
+            columns.created_at,
+            columns.started_at,
+            columns.completed_at,
+        )
+        # NaN compares unequal to itself, so these skip unset timestamps.
+        cycle_times = [c - s for s, c in zip(started, completed) if c - s == c - s]
+        lead_times = [c - o for o, c in zip(created, completed) if c - o == c - o]
+        completed_weeks = Counter(_week(c) for c in completed if c == c)
+        completed_by = Counter(
+            assignee
+            for assignee, c in zip(columns.assignee, completed)
+            if c == c and assignee
+        )
+        current_week = _week(time.time() if now is None else now)
+        weeks = (
+            range(min(completed_weeks), max(current_week, *completed_weeks) + 1)
+            if completed_weeks
+            else range(0)
+        )
+        return cls(
+            team_name=team_name,
+            issue_count=len(created),
+            state_counts=dict(Counter(columns.state_type).most_common()),
+            assignee_counts=dict(completed_by.most_common()),
+            cycle_time=DurationStats.from_seconds(cycle_times),
+            lead_time=DurationStats.from_seconds(lead_times),
+            weekly_throughput={
+                _week_start(week): completed_weeks[week] for week in weeks
+            },
+        )
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """
+    Linearly interpolated percentile of an already sorted, non-empty list.
+    """
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    low, high = sorted_values[lower], sorted_values[upper]
+    return low + (high - low) * (position - lower)
+
+
+def _week(timestamp: float) -> int:
+    """Number of the week a timestamp falls in, counted from the epoch."""
+    return int((timestamp + _WEEK_OFFSET) // WEEK)
+
+
+def _week_start(week: int) -> str:
+    start = datetime.fromtimestamp(week * WEEK - _WEEK_OFFSET, tz=UTC)
+    return start.date().isoformat()
@@ -0,0 +1,228 @@
+"""
+HTTP transports used by `LinearClient` to talk to the API.
+
+Besides the live transport, requests and responses can be recorded to an
+NDJSON cassette and served back from it later, with the recorded latency,
+to re-run the same CLI sessions without network access:
+
+    LINEAR_RECORD=session.ndjson li team
+    LINEAR_REPLAY=session.ndjson LINEAR_CACHE_TTL=0 li team
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Iterator, Optional, Protocol
+
+import requests
+
+REDACTED_HEADERS = {"authorization"}
+
+
+class Response(Protocol):
+    """The part of `requests.Response` the client uses."""
+
+    status_code: int
+    headers: Any
+
+    def json(self) -> Any: ...
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]: ...
+
+    def close(self): ...
+
+    def __enter__(self) -> "Response": ...
+
+    def __exit__(self, *args): ...
+
+
+class Transport(Protocol):
+    def post(
+        self, url: str, headers: dict[str, str], json: dict, stream: bool = False
+    ) -> Response: ...
+
+
+class LiveTransport(Transport):
+    """
+    Sends requests to the API over a pooled `requests.Session`.
+    """
+
+    def __init__(self):
+        self._session = requests.Session()
+
+    def post(
+        self, url: str, headers: dict[str, str], json: dict, stream: bool = False
+    ) -> Response:
+        return self._session.post(url, headers=headers, json=json, stream=stream)
+
+
+class RecordedResponse:
+    """
+    A response served from memory, optionally delivered at a recorded pace.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict[str, str],
+        body: bytes,
+        transfer_time: float = 0.0,
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self._transfer_time = transfer_time
+
+    def json(self) -> Any:
+        time.sleep(self._transfer_time)
+        return json.loads(self._body)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        chunk_count = max(1, -(-len(self._body) // chunk_size))
+        for start in range(0, len(self._body), chunk_size):
+            time.sleep(self._transfer_time / chunk_count)
+            yield self._body[start : start + chunk_size]
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "RecordedResponse":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _request_key(workspace: Optional[str], url: str, body: dict) -> str:
+    # The same query is sent to several workspaces with --all-profiles, the
+    # workspace tells their responses apart.
+    return json.dumps([workspace, url, body], sort_keys=True)
+
+
+class RecordingTransport(Transport):
+    """
+    Forwards requests to another transport and appends every exchange,
+    including headers and timing, to an NDJSON cassette.
+
+    Authorization headers are not written to the cassette, requests are
+    labelled with the `workspace` (the profile name) instead.
+    """
+
+    # Shared by all recorders, the clients of several profiles may record to
+    # the same cassette from different threads. Only one process records a
+    # session, the prefetch process does not inherit LINEAR_RECORD.
+    _lock = threading.Lock()
+
+    def __init__(
+        self, transport: Transport, path: Path, workspace: Optional[str] = None
+    ):
+        self._transport = transport
+        self._path = path
+        self._workspace = workspace
+
+    def post(
+        self, url: str, headers: dict[str, str], json: dict, stream: bool = False
+    ) -> Response:
+        start = time.monotonic()
+        with self._transport.post(url, headers, json, stream=True) as response:
+            first_byte = time.monotonic() - start
+            body = b"".join(response.iter_content(chunk_size=64 * 1024))
+            elapsed = time.monotonic() - start
+            status_code, response_headers = response.status_code, dict(response.headers)
+        self._write(
+            {
+                "request": {
+                    "workspace": self._workspace,
+                    "url": url,
+                    "headers": {
+                        name: value
+                        for name, value in headers.items()
+                        if name.lower() not in REDACTED_HEADERS
+                    },
+                    "body": json,
+                },
+                "response": {
+                    "status_code": status_code,
+                    "headers": response_headers,
+                    "body": body.decode("utf-8"),
+                },
+                "timing": {"first_byte": first_byte, "elapsed": elapsed},
+            }
+        )
+        return RecordedResponse(status_code, response_headers, body)
+
+    def _write(self, exchange: dict):
+        line = json.dumps(exchange)
+        with self._lock, self._path.open("a") as f:
+            f.write(f"{line}\n")
+
+
+class CassetteMissError(LookupError):
+    pass
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses from a cassette written by `RecordingTransport`.
+
+    Identical requests are answered in the order they were recorded, the last
+    answer is repeated once they run out. The recorded latency is reproduced,
+    multiplied by `latency_scale` (0 replays without any delay). Only the
+    requests recorded for `workspace` are answered.
+    """
+
+    def __init__(
+        self, path: Path, latency_scale: float = 1.0, workspace: Optional[str] = None
+    ):
+        self._workspace = workspace
+        self._latency_scale = latency_scale
+        self._exchanges: dict[str, deque[dict]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for line in path.read_text().splitlines():
+            if not line.strip():
+                continue
+            exchange = json.loads(line)
+            request = exchange["request"]
+            key = _request_key(
+                request.get("workspace"), request["url"], request["body"]
+            )
+            self._exchanges[key].append(exchange)
+
+    def post(
+        self, url: str, headers: dict[str, str], json: dict, stream: bool = False
+    ) -> Response:
+        key = _request_key(self._workspace, url, json)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise CassetteMissError(f"No recorded response for request to {url}")
+            exchange = exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+        timing = exchange["timing"]
+        time.sleep(timing["first_byte"] * self._latency_scale)
+        response = exchange["response"]
+        return RecordedResponse(
+            status_code=response["status_code"],
+            headers=response["headers"],
+            body=response["body"].encode("utf-8"),
+            transfer_time=(timing["elapsed"] - timing["first_byte"])
+            * self._latency_scale,
+        )
+
+
+def transport_from_env(workspace: Optional[str] = None) -> Optional[Transport]:
+    """
+    The transport selected by LINEAR_RECORD or LINEAR_REPLAY (with
+    LINEAR_REPLAY_LATENCY_SCALE), None for the default live transport.
+
+    Args:
+        workspace: Name of the profile the transport sends requests for.
+    """
+    if replay := os.environ.get("LINEAR_REPLAY"):
+        scale = float(os.environ.get("LINEAR_REPLAY_LATENCY_SCALE", 1.0))
+        return ReplayTransport(Path(replay), latency_scale=scale, workspace=workspace)
+    if record := os.environ.get("LINEAR_RECORD"):
+        return RecordingTransport(LiveTransport(), Path(record), workspace=workspace)
+    return None
@@ -0,0 +1,159 @@
+"""
+A local listener for Linear webhooks that keeps the cache fresh.
+
+Every event received invalidates the cached responses that mention the
+entities it touches, so cached data can be kept for much longer than the
+default TTL without going stale.
+
+https://developers.linear.app/docs/graphql/webhooks
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from .client import LinearClient
+
+LOGGER = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "Linear-Signature"
+EVENT_HEADER = "Linear-Event"
+DELIVERY_HEADER = "Linear-Delivery"
+
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    """
+    Check the HMAC-SHA256 signature Linear sends along with every webhook.
+    """
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def affected_ids(event: dict) -> set[str]:
+    """
+    Ids of the entities whose cached data an event makes stale.
+
+    Besides the entity itself this includes the issue a comment or attachment
+    belongs to, and the team, assignee and parent an issue is moved from or to,
+    whose listings gain or lose the issue.
+    """
+    data = event.get("data") or {}
+    updated_from = event.get("updatedFrom") or {}
+    ids = {data.get("id"), data.get("issueId"), (data.get("issue") or {}).get("id")}
+    for key in ("teamId", "assigneeId", "parentId"):
+        ids.add(data.get(key))
+        ids.add(updated_from.get(key))
+    return {value for value in ids if value}
+
+
+class WebhookServer(HTTPServer):
+    """
+    Receives webhook events and invalidates the affected cache entries.
+
+    Linear signs the deliveries of every webhook with its own secret, so each
+    workspace's client is registered under the secret of its webhook. An
+    event only invalidates the cache of the workspace it was signed for.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        clients: dict[str, LinearClient],
+        record: Optional[Path] = None,
+    ):
+        super().__init__(address, WebhookHandler)
+        self.clients = clients
+        self.record = record
+
+    def client_for(self, body: bytes, signature: str) -> Optional[LinearClient]:
+        """
+        The client of the workspace whose secret the delivery is signed with.
+        """
+        for secret, client in self.clients.items():
+            if verify_signature(secret, body, signature):
+                return client
+        return None
+
+    def handle_event(self, event: dict, client: LinearClient) -> int:
+        ids = affected_ids(event)
+        removed = client.invalidate(ids)
+        LOGGER.info(
+            "%s %s: invalidated %d cached responses",
+            event.get("action"),
+            event.get("type"),
+            removed,
+        )
+        return removed
+
+    def record_delivery(self, headers: dict[str, str], body: bytes):
+        if self.record is None:
+            return
+        line = json.dumps({"headers": headers, "body": body.decode("utf-8")})
+        with self.record.open("a") as f:
+            f.write(f"{line}\n")
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    server: WebhookServer
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        signature = self.headers.get(SIGNATURE_HEADER, "")
+        if (client := self.server.client_for(body, signature)) is None:
+            LOGGER.warning("Rejected webhook with invalid signature")
+            self.send_response(401)
+            self.end_headers()
+            return
+
+        self.server.record_delivery(
+            {
+                header: value
+                for header in (SIGNATURE_HEADER, EVENT_HEADER, DELIVERY_HEADER)
+                if (value := self.headers.get(header)) is not None
+            },
+            body,
+        )
+        try:
+            event = json.loads(body)
+        except json.JSONDecodeError:
+            self.send_response(400)
+            self.end_headers()
+            return
+        self.server.handle_event(event, client)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        LOGGER.debug(format, *args)
+
+
+def replay_deliveries(path: Path, url: str) -> int:
+    """
+    Send webhook deliveries recorded by a `WebhookServer` to a listener again.
+
+    Returns:
+        The number of deliveries the listener accepted.
+    """
+    accepted = 0
+    with requests.Session() as session:
+        for line in path.read_text().splitlines():
+            if not line.strip():
+                continue
+            delivery = json.loads(line)
+            response = session.post(
+                url,
+                headers={**delivery["headers"], "Content-Type": "application/json"},
+                data=delivery["body"].encode("utf-8"),
+            )
+            if response.ok:
+                accepted += 1
+            else:
+                LOGGER.warning("Delivery rejected with %d", response.status_code)
+    return accepted
@@ -0,0 +1,123 @@
+import json
+import os
+import time
+
+import pytest
+
+from linear.cache import COMPRESS_MIN_SIZE, XDGCache, decode, encode
+
+SMALL = {"data": {"issue": {"id": "uuid-1", "identifier": "ENG-1"}}}
+LARGE = {
+    "data": {
+        "issues": {
+            "nodes": [
+                {"id": f"uuid-{i}", "description": "lorem ipsum " * 20}
+                for i in range(100)
+            ]
+        }
+    }
+}
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("data", [SMALL, LARGE])
+@pytest.mark.parametrize("preparsed", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+def test_encode_decode(data, preparsed, compress):
+    raw = encode(data, preparsed=preparsed, compress=compress)
+    assert decode(raw, preparsed=preparsed) == data
+
+
+def test_compress():
+    size = len(json.dumps(LARGE))
+    assert size > COMPRESS_MIN_SIZE
+    assert len(encode(LARGE, compress=True)) < size / 4
+    assert len(encode(LARGE)) > size / 2
+    # Too small to be worth compressing.
+    assert encode(SMALL, compress=True) == encode(SMALL)
+
+
+def test_pickle_needs_preparsed():
+    assert decode(encode(SMALL, preparsed=True)) is None
+    assert decode(encode(LARGE, preparsed=True)) is None
+
+
+@pytest.mark.parametrize("data", [SMALL, LARGE])
+@pytest.mark.parametrize("preparsed", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+def test_decode_rejects_damaged_entries(data, preparsed, compress):
+    raw = encode(data, preparsed=preparsed, compress=compress)
+    assert decode(b"{}", preparsed=preparsed) is None
+    assert decode(raw[:8], preparsed=preparsed) is None
+    assert decode(raw[:7] + b"\x99" + raw[8:], preparsed=preparsed) is None
+    assert decode(raw[:-10], preparsed=preparsed) is None
+
+
+@pytest.mark.parametrize("preparsed", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+def test_get_set(cache_home, preparsed, compress):
+    cache = XDGCache("linear", preparsed=preparsed, compress=compress)
+    assert cache.get("key") is None
+    cache.set("key", LARGE)
+    assert cache.get("key") == LARGE
+    assert list((cache_home / "linear").glob("*.bin"))
+
+
+def test_expired_entries_are_removed(cache_home):
+    cache = XDGCache("linear", ttl=30)
+    cache.set("key", SMALL)
+    (file,) = (cache_home / "linear").glob("*.bin")
+    past = time.time() - 60
+    os.utime(file, (past, past))
+    assert cache.get("key") is None
+    assert not file.exists()
+
+
+def test_entry_ttl(cache_home):
+    cache = XDGCache("linear", ttl=30)
+    cache.set("key", SMALL, ttl=300)
+    (file,) = (cache_home / "linear").glob("*.bin")
+    assert file.stat().st_mtime > time.time() + 200
+    assert cache.get("key") == SMALL
+
+
+def test_entry_ttl_is_a_minimum(cache_home):
+    cache = XDGCache("linear", ttl=3600)
+    cache.set("key", SMALL, ttl=300)
+    (file,) = (cache_home / "linear").glob("*.bin")
+    assert file.stat().st_mtime <= time.time()
+    assert cache.get("key") == SMALL
+
+
+def test_legacy_json_entries_are_removed_once(cache_home):
+    cache_dir = cache_home / "linear"
+    cache_dir.mkdir()
+    legacy_file = cache_dir / "0123abcd.json"
+    legacy_file.write_text(json.dumps(SMALL))
+    XDGCache("linear")
+    assert not legacy_file.exists()
+    legacy_file.write_text(json.dumps(SMALL))
+    XDGCache("linear")
+    assert legacy_file.exists()
+
+
+def test_invalidate(cache_home):
+    cache = XDGCache("linear")
+    cache.set("small", SMALL)
+    cache.set("large", LARGE)
+    assert cache.invalidate([]) == 0
+    assert cache.invalidate(["uuid-1"]) == 2
+    assert cache.get("small") is None
+    assert cache.get("large") is None
+
+
+def test_invalidate_unrelated(cache_home):
+    cache = XDGCache("linear")
+    cache.set("small", SMALL)
+    assert cache.invalidate(["uuid-2", ""]) == 0
+    assert cache.get("small") == SMALL
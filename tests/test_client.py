@@ -0,0 +1,167 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from linear.cache import XDGCache
+from linear.client import (
+    GET_TEAM_QUERY,
+    Comment,
+    Issue,
+    LinearClient,
+    LinearRequestError,
+    WorkflowState,
+)
+from linear.printer import iter_comments_text
+from linear.transport import RecordedResponse
+
+
+def team_response(issue_count: int) -> dict:
+    nodes = [
+        {
+            "id": f"uuid-{i}",
+            "identifier": f"ENG-{i}",
+            "title": f"Issue {i}",
+            "createdAt": "2024-05-01T10:00:00.000Z",
+            "description": "",
+            "url": f"https://linear.app/acme/issue/ENG-{i}",
+            "assignee": None,
+            "state": {"id": "s1", "name": "Todo", "type": "unstarted"},
+        }
+        for i in range(issue_count)
+    ]
+    return {"data": {"team": {"id": "t1", "name": "Eng", "issues": {"nodes": nodes}}}}
+
+
+class FakeTransport:
+    def __init__(self, body: dict):
+        self.body = json.dumps(body).encode()
+        self.requests = 0
+
+    def post(self, url, headers, json, stream=False):
+        self.requests += 1
+        return RecordedResponse(200, {}, self.body)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return XDGCache("linear")
+
+
+def cached(cache: XDGCache, team_id: str = "t1"):
+    return cache.get(LinearClient._cache_key(GET_TEAM_QUERY, {"team_id": team_id}))
+
+
+def test_iter_team_issues_caches_the_response(cache):
+    transport = FakeTransport(team_response(3))
+    client = LinearClient("url", "key", cache, transport=transport)
+    assert [issue.identifier for issue in client.iter_team_issues("t1")] == [
+        "ENG-0",
+        "ENG-1",
+        "ENG-2",
+    ]
+    assert cached(cache) == team_response(3)
+    assert len(list(client.iter_team_issues("t1"))) == 3
+    assert transport.requests == 1
+
+
+def test_iter_team_issues_stopped_early_is_not_cached(cache):
+    client = LinearClient(
+        "url", "key", cache, transport=FakeTransport(team_response(3))
+    )
+    issues = client.iter_team_issues("t1")
+    next(issues)
+    issues.close()
+    assert cached(cache) is None
+    assert not list(cache._cache_dir.glob("*.tmp"))
+
+
+def test_iter_team_issues_errors_are_not_cached(cache):
+    errors = {"errors": [{"message": "Entity not found", "extensions": {}}]}
+    client = LinearClient("url", "key", cache, transport=FakeTransport(errors))
+    with pytest.raises(LinearRequestError):
+        list(client.iter_team_issues("t1"))
+    assert cached(cache) is None
+
+
+def test_iter_team_issues_compressed_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cache = XDGCache("linear", compress=True)
+    client = LinearClient(
+        "url", "key", cache, transport=FakeTransport(team_response(200))
+    )
+    assert len(list(client.iter_team_issues("t1"))) == 200
+    assert cached(cache) == team_response(200)
+
+
+def comment(comment_id: str, minute: int, parent_id=None) -> Comment:
+    return Comment(
+        id=comment_id,
+        body=f"Comment {comment_id}",
+        created_at=datetime(2024, 5, 1, 10, minute),
+        user_name="Ada",
+        parent_id=parent_id,
+    )
+
+
+def issue_with(comments) -> Issue:
+    return Issue(
+        id="uuid",
+        identifier="ENG-1",
+        title="Title",
+        description=None,
+        created_at=datetime(2024, 5, 1),
+        url="https://linear.app/acme/issue/ENG-1",
+        state=WorkflowState(id="s1", name="Todo", type="unstarted"),
+        children=[],
+        comments=comments,
+    )
+
+
+def ids(comments) -> list[str]:
+    return [comment.id for comment in comments]
+
+
+def test_comment_tree():
+    issue = issue_with(
+        [
+            comment("reply-2", 5, parent_id="top-1"),
+            comment("top-2", 2),
+            comment("nested", 6, parent_id="reply-1"),
+            comment("top-1", 1),
+            comment("reply-1", 3, parent_id="top-1"),
+            # The parent was deleted, or is not part of the response.
+            comment("orphan", 4, parent_id="missing"),
+        ]
+    )
+    tree = issue.comment_tree
+    assert ids(tree[None]) == ["top-1", "top-2", "orphan"]
+    assert ids(tree["top-1"]) == ["reply-1", "reply-2"]
+    assert ids(tree["reply-1"]) == ["nested"]
+    assert "missing" not in tree
+    assert "top-2" not in tree
+
+
+def test_comment_tree_without_comments():
+    assert issue_with(None).comment_tree == {}
+    assert issue_with([]).comment_tree == {}
+
+
+def test_comments_text_depth_first():
+    issue = issue_with(
+        [
+            comment("top-1", 1),
+            comment("reply", 2, parent_id="top-1"),
+            comment("nested", 3, parent_id="reply"),
+            comment("top-2", 4),
+        ]
+    )
+    texts = list(iter_comments_text(issue))
+    bodies = [text.splitlines()[1] for text in texts]
+    assert bodies == [
+        "Comment top-1",
+        "    Comment reply",
+        "        Comment nested",
+        "Comment top-2",
+    ]
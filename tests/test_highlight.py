@@ -0,0 +1,24 @@
+import re
+
+import pytest
+
+from linear import highlight
+
+# Pygments closes every line with an empty, colored whitespace token.
+_EMPTY_TOKEN = re.compile(r"\x1b\[37m(\s*)\x1b\[39;49;00m")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "plain text with **bold** and *emphasis*\n",
+        "# Heading\n## Subheading\n### Section\n",
+        "Use `li team` or [the docs](https://linear.app/docs) ~~not this~~\n",
+        "* item\n- other `code`\n1. first\n  + nested\n> quoted\n",
+        "a - b and 3. c\n\nsecond paragraph\n",
+        "```\ncode block\n\n# not a heading\n```\nafter\n",
+    ],
+)
+def test_markdown_lines_matches_pygments(text):
+    expected = _EMPTY_TOKEN.sub(r"\1", highlight.markdown(text))
+    assert highlight.markdown_lines(text) == expected
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from linear.jsonstream import NodeStream, decode_utf8
+
+TEAM = {
+    "data": {
+        "team": {
+            "id": "t1",
+            "issues": {
+                "nodes": [
+                    {"id": "a", "title": 'Fix [nodes], "quoted"'},
+                    {"id": "b", "title": "Ünïcode ✓", "labels": [1, 2]},
+                    {"id": "c", "title": ""},
+                ]
+            },
+        }
+    }
+}
+
+
+def split_at(text: str, index: int) -> list[str]:
+    return [text[:index], text[index:]]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_nodes_split_at_every_position(indent):
+    text = json.dumps(TEAM, indent=indent, ensure_ascii=False)
+    nodes = TEAM["data"]["team"]["issues"]["nodes"]
+    for index in range(len(text) + 1):
+        stream = NodeStream(split_at(text, index))
+        assert list(stream) == nodes
+        assert stream.document["data"]["team"]["id"] == "t1"
+        assert stream.document["data"]["team"]["issues"]["nodes"] == []
+
+
+def test_utf8_split_at_every_byte():
+    body = json.dumps(TEAM, ensure_ascii=False).encode("utf-8")
+    nodes = TEAM["data"]["team"]["issues"]["nodes"]
+    for index in range(len(body) + 1):
+        chunks = [body[:index], body[index:]]
+        assert list(NodeStream(decode_utf8(chunks))) == nodes
+
+
+def test_one_character_chunks():
+    text = json.dumps(TEAM)
+    assert list(NodeStream(text)) == TEAM["data"]["team"]["issues"]["nodes"]
+
+
+def test_numbers_are_not_split():
+    text = '{"nodes": [12, 345, 6]}'
+    for index in range(len(text) + 1):
+        assert list(NodeStream(split_at(text, index))) == [12, 345, 6]
+
+
+def test_empty_nodes():
+    stream = NodeStream(['{"data": {"nodes": [', " ]}}"])
+    assert list(stream) == []
+    assert stream.document == {"data": {"nodes": []}}
+
+
+def test_error_document():
+    errors = {"errors": [{"message": "Entity not found", "extensions": {}}]}
+    text = json.dumps(errors)
+    stream = NodeStream(split_at(text, 10))
+    assert list(stream) == []
+    assert stream.document == errors
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"nodes": [1 2]}', '{"nodes": [{"id": }]}', '{"nodes": [{"id": "a"},'],
+)
+def test_invalid_nodes(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(NodeStream([text]))
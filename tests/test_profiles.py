@@ -0,0 +1,30 @@
+from linear.profiles import DEFAULT_PROFILE, load_profiles
+
+
+def test_webhook_secrets(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setenv("LINEAR_API_KEY", "default-key")
+    monkeypatch.setenv("LINEAR_WEBHOOK_SECRET", "default-secret")
+    monkeypatch.setenv("GLOBEX_KEY", "globex-key")
+    monkeypatch.setenv("GLOBEX_SECRET", "globex-secret")
+    (tmp_path / "linear").mkdir()
+    (tmp_path / "linear" / "profiles.toml").write_text(
+        "[acme]\n"
+        'api_key = "acme-key"\n'
+        'webhook_secret = "acme-secret"\n'
+        "[globex]\n"
+        'api_key_env = "GLOBEX_KEY"\n'
+        'webhook_secret_env = "GLOBEX_SECRET"\n'
+        "[initech]\n"
+        'api_key = "initech-key"\n'
+        "[unset]\n"
+        'api_key_env = "UNSET_KEY"\n'
+    )
+    profiles = load_profiles()
+    assert {name: profile.webhook_secret for name, profile in profiles.items()} == {
+        DEFAULT_PROFILE: "default-secret",
+        "acme": "acme-secret",
+        "globex": "globex-secret",
+        "initech": None,
+    }
+    assert profiles["globex"].api_key == "globex-key"
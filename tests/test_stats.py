@@ -0,0 +1,119 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from linear.stats import (
+    DAY,
+    DurationStats,
+    IssueColumns,
+    TeamStats,
+    _week,
+    _week_start,
+    percentile,
+)
+
+
+def node(created, started=None, completed=None, state="completed", assignee=None):
+    return {
+        "createdAt": created,
+        "startedAt": started,
+        "completedAt": completed,
+        "state": {"type": state},
+        "assignee": {"name": assignee} if assignee else None,
+    }
+
+
+def timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+@pytest.mark.parametrize(
+    "percent, expected",
+    [(0, 1.0), (50, 2.5), (75, 3.25), (90, 3.7), (100, 4.0)],
+)
+def test_percentile(percent, expected):
+    assert percentile([1.0, 2.0, 3.0, 4.0], percent) == pytest.approx(expected)
+
+
+def test_percentile_single_value():
+    assert percentile([5.0], 90) == 5.0
+
+
+@pytest.mark.parametrize(
+    "value, monday",
+    [
+        ("2024-01-01T00:00:00Z", "2024-01-01"),  # Monday
+        ("2024-01-07T23:59:59Z", "2024-01-01"),  # Sunday
+        ("2024-01-08T00:00:00Z", "2024-01-08"),
+        ("1970-01-01T00:00:00Z", "1969-12-29"),  # The epoch is a Thursday
+    ],
+)
+def test_week_start(value, monday):
+    assert _week_start(_week(timestamp(value))) == monday
+
+
+def test_duration_stats():
+    stats = DurationStats.from_seconds([3 * DAY, 1 * DAY, 2 * DAY])
+    assert stats == DurationStats(count=3, mean=2.0, p50=2.0, p75=2.5, p90=2.8)
+    assert DurationStats.from_seconds([]) is None
+
+
+def test_from_columns():
+    nodes = [
+        node(
+            "2024-01-01T09:00:00Z",
+            "2024-01-02T09:00:00Z",
+            "2024-01-04T09:00:00Z",
+            assignee="Ada",
+        ),
+        node(
+            "2024-01-01T09:00:00Z",
+            "2024-02-26T09:00:00Z",
+            "2024-02-27T09:00:00Z",
+            assignee="Ada",
+        ),
+        node("2024-01-03T09:00:00Z", None, "2024-01-05T09:00:00Z", assignee="Bo"),
+        node("2024-01-03T09:00:00Z", "2024-01-04T09:00:00Z", state="started"),
+        node("2024-01-03T09:00:00Z", state="backlog", assignee="Bo"),
+    ]
+    stats = TeamStats.from_columns(
+        "Eng", IssueColumns.from_nodes(nodes), now=timestamp("2024-03-13T12:00:00Z")
+    )
+    assert stats.team_name == "Eng"
+    assert stats.issue_count == 5
+    assert stats.state_counts == {"completed": 3, "started": 1, "backlog": 1}
+    assert stats.assignee_counts == {"Ada": 2, "Bo": 1}
+    assert stats.cycle_time.count == 2
+    assert stats.cycle_time.mean == pytest.approx(1.5)
+    assert stats.lead_time.count == 3
+    assert stats.lead_time.p50 == pytest.approx(3.0)
+    assert stats.weekly_throughput == {
+        "2024-01-01": 2,
+        "2024-01-08": 0,
+        "2024-01-15": 0,
+        "2024-01-22": 0,
+        "2024-01-29": 0,
+        "2024-02-05": 0,
+        "2024-02-12": 0,
+        "2024-02-19": 0,
+        "2024-02-26": 1,
+        "2024-03-04": 0,
+        "2024-03-11": 0,
+    }
+
+
+def test_from_columns_without_completed_issues():
+    nodes = [node("2024-01-03T09:00:00Z", state="backlog")]
+    stats = TeamStats.from_columns("Eng", IssueColumns.from_nodes(nodes))
+    assert stats.cycle_time is None
+    assert stats.lead_time is None
+    assert stats.assignee_counts == {}
+    assert stats.weekly_throughput == {}
+
+
+def test_from_nodes_missing_timestamps():
+    columns = IssueColumns.from_nodes([node("2024-01-03T09:00:00Z")])
+    assert math.isnan(columns.started_at[0])
+    assert math.isnan(columns.completed_at[0])
+    assert columns.assignee == [None]
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from linear.transport import (
+    CassetteMissError,
+    RecordedResponse,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+URL = "https://api.linear.app/graphql"
+ME = {"query": "query Me { viewer { id } }", "variables": {}}
+
+
+class FakeTransport:
+    """Answers every request with the next of the given bodies."""
+
+    def __init__(self, *bodies: dict):
+        self._bodies = list(bodies)
+
+    def post(self, url, headers, json, stream=False):
+        body = self._bodies.pop(0)
+        return RecordedResponse(200, {"Content-Type": "application/json"}, body)
+
+
+def viewer(viewer_id: str) -> bytes:
+    return json.dumps({"data": {"viewer": {"id": viewer_id}}}).encode()
+
+
+def record(path, workspace, *bodies):
+    transport = RecordingTransport(FakeTransport(*bodies), path, workspace=workspace)
+    return [
+        transport.post(URL, {"Authorization": f"{workspace}-key"}, ME).json()
+        for _ in bodies
+    ]
+
+
+def test_record_replay_round_trip(tmp_path):
+    cassette = tmp_path / "session.ndjson"
+    recorded = record(cassette, "acme", viewer("u1"), viewer("u2"))
+    assert "acme-key" not in cassette.read_text()
+
+    replay = ReplayTransport(cassette, latency_scale=0, workspace="acme")
+    replayed = [replay.post(URL, {}, ME).json() for _ in range(3)]
+    # Answered in the recorded order, the last answer is repeated.
+    assert replayed == [*recorded, recorded[-1]]
+
+
+def test_replay_streamed(tmp_path):
+    cassette = tmp_path / "session.ndjson"
+    record(cassette, "acme", viewer("u1"))
+    replay = ReplayTransport(cassette, latency_scale=0, workspace="acme")
+    with replay.post(URL, {}, ME, stream=True) as response:
+        assert response.status_code == 200
+        assert b"".join(response.iter_content(chunk_size=4)) == viewer("u1")
+
+
+def test_replay_keeps_workspaces_apart(tmp_path):
+    cassette = tmp_path / "session.ndjson"
+    record(cassette, "acme", viewer("acme-user"))
+    record(cassette, "globex", viewer("globex-user"))
+    for workspace in ("globex", "acme"):
+        replay = ReplayTransport(cassette, latency_scale=0, workspace=workspace)
+        data = replay.post(URL, {}, ME).json()
+        assert data["data"]["viewer"]["id"] == f"{workspace}-user"
+
+
+def test_cassette_miss(tmp_path):
+    cassette = tmp_path / "session.ndjson"
+    record(cassette, "acme", viewer("u1"))
+    with pytest.raises(CassetteMissError):
+        ReplayTransport(cassette, workspace="globex").post(URL, {}, ME)
+    other = {"query": "query Other { viewer { id } }", "variables": {}}
+    with pytest.raises(CassetteMissError):
+        ReplayTransport(cassette, workspace="acme").post(URL, {}, other)
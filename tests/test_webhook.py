@@ -0,0 +1,104 @@
+import hashlib
+import hmac
+import threading
+
+import pytest
+import requests
+
+from linear.webhook import (
+    SIGNATURE_HEADER,
+    WebhookServer,
+    affected_ids,
+    verify_signature,
+)
+
+
+def test_affected_ids_issue_update():
+    event = {
+        "type": "Issue",
+        "action": "update",
+        "data": {
+            "id": "issue-1",
+            "teamId": "team-2",
+            "assigneeId": "user-2",
+            "parentId": None,
+        },
+        "updatedFrom": {"teamId": "team-1", "assigneeId": "user-1"},
+    }
+    assert affected_ids(event) == {"issue-1", "team-1", "team-2", "user-1", "user-2"}
+
+
+def test_affected_ids_comment():
+    event = {
+        "type": "Comment",
+        "action": "create",
+        "data": {"id": "comment-1", "issueId": "issue-1"},
+    }
+    assert affected_ids(event) == {"comment-1", "issue-1"}
+
+
+def test_affected_ids_attachment():
+    event = {
+        "type": "Attachment",
+        "action": "remove",
+        "data": {"id": "attachment-1", "issue": {"id": "issue-1"}},
+    }
+    assert affected_ids(event) == {"attachment-1", "issue-1"}
+
+
+def test_affected_ids_without_data():
+    assert affected_ids({"type": "Issue"}) == set()
+
+
+def test_verify_signature():
+    body = b'{"type": "Issue"}'
+    signature = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    assert verify_signature("secret", body, signature)
+    assert not verify_signature("other", body, signature)
+    assert not verify_signature("secret", body + b" ", signature)
+
+
+class RecordingClient:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, ids):
+        self.invalidated.append(set(ids))
+        return len(self.invalidated)
+
+
+@pytest.fixture
+def server():
+    clients = {"acme-secret": RecordingClient(), "globex-secret": RecordingClient()}
+    server = WebhookServer(("127.0.0.1", 0), clients)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def deliver(server: WebhookServer, secret: str, body: bytes) -> int:
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    host, port = server.server_address[:2]
+    response = requests.post(
+        f"http://{host}:{port}/", data=body, headers={SIGNATURE_HEADER: signature}
+    )
+    return response.status_code
+
+
+def test_server_invalidates_the_signing_workspace(server):
+    body = b'{"action": "update", "type": "Issue", "data": {"id": "issue-1"}}'
+    assert deliver(server, "globex-secret", body) == 200
+    assert server.clients["globex-secret"].invalidated == [{"issue-1"}]
+    assert server.clients["acme-secret"].invalidated == []
+
+
+def test_server_rejects_unknown_secret(server):
+    body = b'{"action": "update", "type": "Issue", "data": {"id": "issue-1"}}'
+    assert deliver(server, "other-secret", body) == 401
+    assert all(not client.invalidated for client in server.clients.values())
+
+
+def test_server_rejects_invalid_json(server):
+    assert deliver(server, "acme-secret", b"{") == 400